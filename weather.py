@@ -52,10 +52,16 @@ Usage:
   ./weather.py --help, -h
       Show help message
 """
-import argparse
+import functools
+import hashlib
+import io
 import json
 import os
+import pickle
 import sys
+import tempfile
+import threading
+import time
 from datetime import datetime
 
 try:
@@ -92,9 +98,33 @@ try:
 except ImportError:
     print("Missing required module: wcwidth. Please install it with 'pip install wcwidth'.")
     sys.exit(1)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# JSON file helpers: use orjson when installed, otherwise the stdlib json module.
+# indent=False writes compact JSON for large machine-managed files.
+if orjson is not None:
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _json_dumps(obj, indent=True):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+else:
+    def _json_loads(data):
+        return json.loads(data)
+
+    def _json_dumps(obj, indent=True):
+        if indent:
+            return json.dumps(obj, indent=2).encode("utf-8")
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
 
 
 # Config file support for default unit
+# Resolved once per run; every get_*_path helper builds on it
+@functools.lru_cache(maxsize=None)
 def get_app_dir():
     if getattr(sys, "frozen", False):
         return os.path.abspath(os.path.dirname(sys.executable))
@@ -105,12 +135,25 @@ def get_config_path():
     return os.path.join(get_app_dir(), 'config.json')
 
 
+# Parsed JSON files are cached per (path, mtime) so repeated loads in one run are free
+def _file_mtime_ns(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
 def load_config():
     path = get_config_path()
-    if os.path.exists(path):
+    return _load_config_cached(path, _file_mtime_ns(path))
+
+
+@functools.lru_cache(maxsize=4)
+def _load_config_cached(path, mtime_ns):
+    if mtime_ns is not None:
         try:
-            with open(path, 'r') as f:
-                return json.load(f)
+            with open(path, 'rb') as f:
+                return _json_loads(f.read())
         except Exception as e:
             print(f"Warning: Could not load config.json: {e}")
     return {}
@@ -156,112 +199,234 @@ def setup_default_config():
                 },
             },
         }
-        with open(path, "w") as dst:
-            json.dump(data, dst, indent=2)
+        with open(path, "wb") as dst:
+            dst.write(_json_dumps(data))
+        _load_config_cached.cache_clear()
         print(f"Created default config.json at {path}")
     except Exception as e:
         print(f"Error: Could not create config.json: {e}")
 
 
 # Utility to write output to both console and a file
+# (file output is captured in memory and written once on close)
 
 class Tee:
     def __init__(self, filename):
         self.file = open(filename, 'w')
+        self.captured = io.StringIO()
         self.stdout = sys.stdout
         sys.stdout = self
 
     def write(self, data):
-        self.file.write(data)
-        self.stdout.write(data)
+        if not data:
+            return 0
+        self.captured.write(data)
+        return self.stdout.write(data)
 
     def flush(self):
-        self.file.flush()
         self.stdout.flush()
 
     def close(self):
         sys.stdout = self.stdout
+        self.file.write(self.captured.getvalue())
         self.file.close()
 
 
 DEBUG = False
 REQUEST_TIMEOUT = 10
+MAX_FETCH_WORKERS = 16
+# Locations per multi-coordinate Open-Meteo request (keeps the URL a few KB at most)
+MAX_BATCH_LOCATIONS = 50
+# Open-Meteo refreshes current conditions every 15 minutes
+WEATHER_CACHE_TTL = 900
+
+# Shared session so repeated requests reuse pooled keep-alive connections.
+# Created on first use; commands that never hit the network don't build it.
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _get_session():
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            session = requests.Session()
+            session.mount("https://", requests.adapters.HTTPAdapter(
+                pool_connections=MAX_FETCH_WORKERS,
+                pool_maxsize=MAX_FETCH_WORKERS,
+            ))
+            _SESSION = session
+        return _SESSION
 
 
 # Fetch weather for all favorites
-def weather_for_favorites(show_forecast=False, debug=False, days=7, temp_unit_override=None, no_emoji=False):
-    favorites = load_favorites()
-    airports = load_airports()
+def weather_for_favorites(
+    show_forecast=False,
+    debug=False,
+    days=7,
+    temp_unit_override=None,
+    no_emoji=False,
+    favorites=None,
+    airports=None,
+    config=None,
+):
+    # Callers that already loaded these files pass them in so each is read once
+    if favorites is None:
+        favorites = load_favorites()
+    if airports is None:
+        airports = load_airports()
     if not favorites:
         print("No favorites set.")
         return
+    codes = sorted(set(favorites))
     if debug:
-        print(f"DEBUG: Running weather_for_favorites with: {sorted(favorites)}")
+        print(f"DEBUG: Running weather_for_favorites with: {codes}")
+    if config is None:
+        config = load_config()
     # CLI override
-    for code in sorted(favorites):
+    temp_unit = _resolve_temp_unit(temp_unit_override, config)
+    urls = {code: _build_url(airports[code], temp_unit, days) for code in codes if code in airports}
+    # Fetch in multi-location batches (alias codes with the same coordinates share a URL);
+    # render serially below so output order stays stable
+    locations = {}
+    for code, url in urls.items():
+        locations.setdefault(url, airports[code])
+    locations = list(locations.items())
+    batches = [locations[i:i + MAX_BATCH_LOCATIONS] for i in range(0, len(locations), MAX_BATCH_LOCATIONS)]
+    _prune_http_cache()
+    responses = {}
+    if len(batches) == 1:
+        responses.update(_fetch_weather_batch(batches[0], temp_unit, days, debug=debug))
+    elif batches:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(batches))) as pool:
+            for batch_responses in pool.map(lambda batch: _fetch_weather_batch(batch, temp_unit, days, debug=debug), batches):
+                responses.update(batch_responses)
+    for code in codes:
         if debug:
             print(f"DEBUG: Processing favorite {code}")
-        if code in airports:
-            get_weather_by_airport(
-                code,
-                show_forecast=show_forecast,
-                debug=debug,
-                days=days,
-                temp_unit_override=temp_unit_override,
-                airports=airports,
-                no_emoji=no_emoji,
-            )
-        else:
+        if code not in airports:
             print(f"{code}: (not found in airports.json)")
+            continue
+        if debug:
+            print(f"DEBUG: Cache key URL: {urls[code]}")
+        result = responses[urls[code]]
+        if isinstance(result, requests.RequestException):
+            print(f"Error: Could not fetch weather for {code}: {result}")
+            continue
+        status_code, content, from_cache = result
+        data = _parse_weather_response(code, status_code, content, from_cache=from_cache, debug=debug)
+        if data is None:
+            continue
+        _render_weather(
+            code,
+            airports[code],
+            data,
+            config,
+            temp_unit,
+            show_forecast=show_forecast,
+            days=days,
+            no_emoji=no_emoji,
+        )
 
 # Load airports from airports.json in the project directory
 def get_airports_path():
     return os.path.join(get_app_dir(), 'airports.json')
 
 
+def _replace_file(path, data):
+    """
+    Write bytes to a uniquely named temp file beside path and os.replace() it in,
+    so concurrent writers never share a temp file and readers never see a partial file.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        # mkstemp creates the file owner-only; keep the permissions of the file being replaced
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except OSError:
+            mode = 0o644
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+# Pre-parsed airports are pickled beside airports.json, keyed on its mtime.
+# Bump the version whenever the shape of the cached records changes.
+AIRPORTS_CACHE_VERSION = 3
+
+
+def get_airports_cache_path():
+    return os.path.join(get_app_dir(), 'airports.cache.pkl')
+
+
+def _read_airports_cache(mtime_ns):
+    try:
+        with open(get_airports_cache_path(), 'rb') as f:
+            version, cached_mtime_ns, airports = pickle.load(f)
+    except Exception:
+        return None
+    if version != AIRPORTS_CACHE_VERSION or cached_mtime_ns != mtime_ns:
+        return None
+    return airports
+
+
+def _write_airports_cache(mtime_ns, airports):
+    data = pickle.dumps((AIRPORTS_CACHE_VERSION, mtime_ns, airports), protocol=pickle.HIGHEST_PROTOCOL)
+    try:
+        # Unique temp file per writer: a background update and a lookup may rebuild it at once
+        _replace_file(get_airports_cache_path(), data)
+    except OSError:
+        # Cache is best-effort (e.g. read-only install dir or full disk)
+        pass
+
+
+# Field order and defaults for airport records (see "airports.json fields" in README)
+_AIRPORT_DEFAULTS = {
+    "name": "",
+    "city": "",
+    "lat": 0,
+    "lon": 0,
+    "icao_code": "",
+    "iata_code": "",
+    "iso_country": "",
+    "iso_region": "",
+    "elevation_ft": None,
+    "type": "",
+    "scheduled_service": "",
+    "local_code": "",
+    "gps_code": "",
+    "faa_lid": "",
+}
+
+
+# Fields whose values repeat across many airports (countries, regions, towns)
+_AIRPORT_SHARED_FIELDS = ("city", "iso_country", "iso_region", "type", "scheduled_service")
+
+
 def load_airports():
     path = get_airports_path()
-    if os.path.exists(path):
+    return _load_airports_cached(path, _file_mtime_ns(path))
+
+
+@functools.lru_cache(maxsize=4)
+def _load_airports_cached(path, mtime_ns):
+    if mtime_ns is not None:
+        airports = _read_airports_cache(mtime_ns)
+        if airports is not None:
+            return airports
         try:
-            with open(path, 'r') as f:
-                data = json.load(f)
-            airports = {}
-            for code, entry in data.items():
-                code_upper = code.upper()
-                if isinstance(entry, dict):
-                    airports[code_upper] = {
-                        "name": entry.get("name", ""),
-                        "city": entry.get("city", ""),
-                        "lat": float(entry.get("lat", 0)),
-                        "lon": float(entry.get("lon", 0)),
-                        "icao_code": entry.get("icao_code", ""),
-                        "iata_code": entry.get("iata_code", ""),
-                        "iso_country": entry.get("iso_country", ""),
-                        "iso_region": entry.get("iso_region", ""),
-                        "elevation_ft": entry.get("elevation_ft"),
-                        "type": entry.get("type", ""),
-                        "scheduled_service": entry.get("scheduled_service", ""),
-                        "local_code": entry.get("local_code", ""),
-                        "gps_code": entry.get("gps_code", ""),
-                        "faa_lid": entry.get("faa_lid", entry.get("local_code", "")),
-                    }
-                elif isinstance(entry, (list, tuple)) and len(entry) >= 4:
-                    airports[code_upper] = {
-                        "name": entry[0],
-                        "city": entry[1],
-                        "lat": float(entry[2]),
-                        "lon": float(entry[3]),
-                        "icao_code": "",
-                        "iata_code": "",
-                        "iso_country": "",
-                        "iso_region": "",
-                        "elevation_ft": None,
-                        "type": "",
-                        "scheduled_service": "",
-                        "local_code": "",
-                        "gps_code": "",
-                        "faa_lid": "",
-                    }
+            with open(path, 'rb') as f:
+                data = _json_loads(f.read())
+            airports = _normalize_airports(data)
+            _write_airports_cache(mtime_ns, airports)
             return airports
         except Exception as e:
             print(f"Warning: Could not load airports.json: {e}")
@@ -269,101 +434,132 @@ def load_airports():
     return {}
 
 
+def _normalize_airports(data):
+    """Turn parsed airports.json data into the in-memory record dicts."""
+    airports = {}
+    shared_values = {}
+    shared_rows = {}
+    for code, entry in data.items():
+        code_upper = code.upper()
+        if isinstance(entry, dict):
+            row = {**_AIRPORT_DEFAULTS, **entry}
+            row["lat"] = float(row["lat"])
+            row["lon"] = float(row["lon"])
+            if "faa_lid" not in entry:
+                row["faa_lid"] = row["local_code"]
+            # Share one object per distinct value so it is stored (and pickled) once
+            for field in _AIRPORT_SHARED_FIELDS:
+                value = row[field]
+                row[field] = shared_values.setdefault(value, value)
+            # Alias codes of one airport are saved as identical entries; keep a single record
+            try:
+                row = shared_rows.setdefault(tuple(row.values()), row)
+            except TypeError:
+                pass
+            airports[code_upper] = row
+        elif isinstance(entry, (list, tuple)) and len(entry) >= 4:
+            airports[code_upper] = {
+                **_AIRPORT_DEFAULTS,
+                "name": entry[0],
+                "city": entry[1],
+                "lat": float(entry[2]),
+                "lon": float(entry[3]),
+            }
+    # Precompute search haystacks so they are stored in the pickle cache
+    for entry in airports.values():
+        if "_search" not in entry:
+            entry["_search"] = _airport_haystack(entry)
+    return airports
+
+
 def save_airports(airports):
     path = get_airports_path()
     data = {}
+    # Alias codes often share one record object; convert each distinct record once
+    rows_by_id = {}
     for code, entry in airports.items():
         if isinstance(entry, dict):
-            data[code.upper()] = {
-                "name": entry.get("name", ""),
-                "city": entry.get("city", ""),
-                "lat": entry.get("lat", 0),
-                "lon": entry.get("lon", 0),
-                "icao_code": entry.get("icao_code", ""),
-                "iata_code": entry.get("iata_code", ""),
-                "iso_country": entry.get("iso_country", ""),
-                "iso_region": entry.get("iso_region", ""),
-                "elevation_ft": entry.get("elevation_ft"),
-                "type": entry.get("type", ""),
-                "scheduled_service": entry.get("scheduled_service", ""),
-                "local_code": entry.get("local_code", ""),
-                "gps_code": entry.get("gps_code", ""),
-                "faa_lid": entry.get("faa_lid", entry.get("local_code", "")),
-            }
+            row = rows_by_id.get(id(entry))
+            if row is None:
+                # Only the documented fields are written (no private keys like "_search")
+                row = {field: entry.get(field, default) for field, default in _AIRPORT_DEFAULTS.items()}
+                if "faa_lid" not in entry:
+                    row["faa_lid"] = row["local_code"]
+                rows_by_id[id(entry)] = row
+            data[code.upper()] = row
         else:
             name, city, lat, lon = entry
             data[code.upper()] = {
+                **_AIRPORT_DEFAULTS,
                 "name": name,
                 "city": city,
                 "lat": lat,
                 "lon": lon,
-                "icao_code": "",
-                "iata_code": "",
-                "iso_country": "",
-                "iso_region": "",
-                "elevation_ft": None,
-                "type": "",
-                "scheduled_service": "",
-                "local_code": "",
-                "gps_code": "",
-                "faa_lid": "",
             }
-    with open(path, 'w') as f:
-        json.dump(data, f, indent=2)
-
-
-def weather_code_to_emoji(code, with_emoji=True):
-    # Open-Meteo weather codes: https://open-meteo.com/en/docs#api_form
+    _replace_file(path, _json_dumps(data, indent=False))
+    _load_airports_cached.cache_clear()
+    # Refresh the binary cache now so the next load skips parsing the JSON
+    mtime_ns = _file_mtime_ns(path)
+    if mtime_ns is not None:
+        _write_airports_cache(mtime_ns, _normalize_airports(data))
+
+
+# Open-Meteo weather codes: https://open-meteo.com/en/docs#api_form
+_WCODE_MAP = {
+    0: ("☀️", "Clear"),
+    **{c: ("⛅", "Partly Cloudy") for c in (1, 2, 3)},
+    **{c: ("🌫️", "Fog") for c in (45, 48)},
+    **{c: ("🌦️", "Drizzle") for c in (51, 53, 55, 56, 57)},
+    **{c: ("🌧️", "Rain") for c in (61, 63, 65, 66, 67, 80, 81, 82)},
+    **{c: ("❄️", "Snow") for c in (71, 73, 75, 77, 85, 86)},
+    **{c: ("⛈️", "Thunderstorm") for c in (95, 96, 99)},
+}
+_WCODE_UNKNOWN = ("❓", "Unknown")
+
+
+def _weather_code_parts(code):
     try:
         code = int(code)
     except (TypeError, ValueError):
-        return "❓ Unknown" if with_emoji else "Unknown"
-    if code == 0:
-        return "☀️ Clear" if with_emoji else "Clear"
-    elif code in (1, 2, 3):
-        return "⛅ Partly Cloudy" if with_emoji else "Partly Cloudy"
-    elif code in (45, 48):
-        return "🌫️ Fog" if with_emoji else "Fog"
-    elif code in (51, 53, 55, 56, 57):
-        return "🌦️ Drizzle" if with_emoji else "Drizzle"
-    elif code in (61, 63, 65, 66, 67, 80, 81, 82):
-        return "🌧️ Rain" if with_emoji else "Rain"
-    elif code in (71, 73, 75, 77, 85, 86):
-        return "❄️ Snow" if with_emoji else "Snow"
-    elif code in (95, 96, 99):
-        return "⛈️ Thunderstorm" if with_emoji else "Thunderstorm"
-    return "❓ Unknown" if with_emoji else "Unknown"
+        return _WCODE_UNKNOWN
+    return _WCODE_MAP.get(code, _WCODE_UNKNOWN)
 
 
-def get_weather_by_airport(
-    airport_code,
-    show_forecast=False,
-    debug=False,
-    days=7,
-    temp_unit_override=None,
-    airports=None,
-    no_emoji=False,
-):
-    if debug:
-        print(f"DEBUG: get_weather_by_airport({airport_code}, show_forecast={show_forecast}, days={days})")
-    airports = airports or load_airports()
-    airport = airports.get(airport_code.upper())
-    if not airport:
-        print(f"Unknown airport code: {airport_code}")
-        return
-    # Determine temperature unit from config
-    config = load_config()
-    temp_unit = (temp_unit_override or config.get('unit', 'C')).upper()
+def weather_code_to_emoji(code, with_emoji=True):
+    emoji, text = _weather_code_parts(code)
+    return f"{emoji} {text}" if with_emoji else text
+
+
+# Terminal display width of a string
+def _display_width(text):
+    # Dates, temperatures and times are plain ASCII: one column per character
+    if text.isascii():
+        return len(text)
+    return _wide_display_width(text)
+
+
+# Emoji/description cells repeat a lot, so cache their wcswidth
+@functools.lru_cache(maxsize=4096)
+def _wide_display_width(text):
+    width = wcswidth(text)
+    if width < 0:
+        width = len(text)
+    return width
+
+
+def _resolve_temp_unit(temp_unit_override, config):
+    return (temp_unit_override or config.get('unit', 'C')).upper()
+
+
+def _build_url(airport, temp_unit, days):
+    return _build_batch_url([airport], temp_unit, days)
+
+
+def _build_batch_url(airports, temp_unit, days):
+    # Open-Meteo takes comma-separated coordinates and answers with one result per location
     temp_param = 'fahrenheit' if temp_unit == 'F' else 'celsius'
-    temp_symbol = '°F' if temp_unit == 'F' else '°C'
-    provider = config.get('provider', 'open-meteo')
-    providers = config.get('providers', {})
-    provider_info = providers.get(provider, {})
-    provider_url = provider_info.get('url', 'https://api.open-meteo.com/v1/forecast')
-    name = airport.get("name", "")
-    city = airport.get("city", "")
-    lat = airport.get("lat", 0)
-    lon = airport.get("lon", 0)
+    lat = ",".join(str(airport.get("lat", 0)) for airport in airports)
+    lon = ",".join(str(airport.get("lon", 0)) for airport in airports)
     # For now, only open-meteo is implemented for live data
     current_vars = ",".join([
         "temperature_2m",
@@ -384,32 +580,330 @@ def get_weather_by_airport(
         "wind_direction_10m",
         "wind_gusts_10m",
     ])
-    url = (
+    return (
         f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}"
         f"&current={current_vars}&temperature_unit={temp_param}&wind_speed_unit=kn"
         f"&daily=temperature_2m_max,temperature_2m_min,weathercode,precipitation_sum,sunrise,sunset&forecast_days={days}&timezone=auto"
     )
-    if debug:
-        print(f"DEBUG: Requesting URL: {url}")
+
+
+# Successful weather responses are cached on disk for WEATHER_CACHE_TTL seconds
+def get_http_cache_dir():
+    return os.path.join(get_app_dir(), '.http_cache')
+
+
+def _http_cache_path(url):
+    return os.path.join(get_http_cache_dir(), hashlib.sha1(url.encode("utf-8")).hexdigest())
+
+
+def _read_http_cache(url):
+    path = _http_cache_path(url)
+    try:
+        if time.time() - os.stat(path).st_mtime > WEATHER_CACHE_TTL:
+            return None
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _write_http_cache(url, content):
+    try:
+        os.makedirs(get_http_cache_dir(), exist_ok=True)
+        _replace_file(_http_cache_path(url), content)
+    except OSError:
+        pass
+
+
+def _prune_http_cache():
+    # Drop expired entries (called once per command) so the cache does not grow without bound
+    now = time.time()
+    try:
+        entries = list(os.scandir(get_http_cache_dir()))
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if now - entry.stat().st_mtime > WEATHER_CACHE_TTL:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def _fetch_weather(url):
+    # Returns (status_code, content, from_cache)
+    content = _read_http_cache(url)
+    if content is not None:
+        return 200, content, True
+    resp = _get_session().get(url, timeout=REQUEST_TIMEOUT)
+    if resp.status_code == 200 and _is_weather_payload(resp.content):
+        _write_http_cache(url, resp.content)
+    return resp.status_code, resp.content, False
+
+
+def _is_weather_payload(content):
+    # Only real Open-Meteo results are cached, not e.g. a captive-portal page served with 200
     try:
-        resp = requests.get(url, timeout=REQUEST_TIMEOUT)
+        data = _json_loads(content)
+    except ValueError:
+        return False
+    return isinstance(data, dict) and not data.get("error") and ("current" in data or "daily" in data)
+
+
+def _fetch_weather_batch(locations, temp_unit, days, debug=False):
+    """
+    Fetch weather for several (url, airport) pairs with one Open-Meteo request.
+
+    Returns {url: (status_code, content, from_cache) or RequestException}. Each
+    location is cached under its own single-airport URL, so later lookups of
+    one airport reuse it.
+    """
+    results = {}
+    missing = []
+    for url, airport in locations:
+        content = _read_http_cache(url)
+        if content is not None:
+            results[url] = (200, content, True)
+        else:
+            missing.append((url, airport))
+    if len(missing) > 1:
+        batch_url = _build_batch_url([airport for _, airport in missing], temp_unit, days)
         if debug:
-            print(f"DEBUG: HTTP status: {resp.status_code}")
+            print(f"DEBUG: Requesting batch URL: {batch_url}")
         try:
-            data = resp.json()
-            if debug:
-                print(f"DEBUG: Response JSON: {json.dumps(data, indent=2)[:1000]}")
-        except Exception as e:
-            if debug:
-                print(f"DEBUG: Failed to parse JSON: {e}")
-            data = {}
+            resp = _get_session().get(batch_url, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException as e:
+            for url, _ in missing:
+                results[url] = e
+            return results
+        if resp.status_code == 200:
+            try:
+                payloads = _json_loads(resp.content)
+            except ValueError:
+                payloads = None
+            if isinstance(payloads, list) and len(payloads) == len(missing):
+                for (url, _), payload in zip(missing, payloads):
+                    content = _json_dumps(payload, indent=False)
+                    _write_http_cache(url, content)
+                    results[url] = (200, content, False)
+                return results
+        elif resp.status_code != 400:
+            # Rate limited or server error: per-location retries would only add load
+            for url, _ in missing:
+                results[url] = (resp.status_code, resp.content, False)
+            return results
+    # Single location, or the batch was rejected (400) or malformed: fetch each location
+    if debug:
+        for url, _ in missing:
+            print(f"DEBUG: Requesting URL: {url}")
+    results.update(_fetch_weather_each([url for url, _ in missing]))
+    return results
+
+
+def _fetch_weather_each(urls):
+    # One request per URL, run concurrently; returns {url: result or RequestException}
+    def fetch(url):
+        try:
+            return _fetch_weather(url)
+        except requests.RequestException as e:
+            return e
+    if len(urls) <= 1:
+        return {url: fetch(url) for url in urls}
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(urls))) as pool:
+        return dict(zip(urls, pool.map(fetch, urls)))
+
+
+def _parse_weather_response(airport_code, status_code, content, from_cache=False, debug=False):
+    if debug:
+        print(f"DEBUG: HTTP status: {status_code}{' (cached)' if from_cache else ''}")
+    try:
+        data = _json_loads(content)
+        if debug:
+            print(f"DEBUG: Response JSON: {content[:1000].decode('utf-8', errors='replace')}")
+    except Exception as e:
+        if debug:
+            print(f"DEBUG: Failed to parse JSON: {e}")
+        data = {}
+    if status_code != 200:
+        print(f"Error: Could not fetch weather for {airport_code} (status {status_code})")
+        return None
+    return data
+
+
+# Longest code in OurAirports data is 7 characters (e.g. LAD2230)
+MAX_AIRPORT_CODE_LENGTH = 7
+
+
+def is_plausible_airport_code(code):
+    # Cheap shape check so obvious garbage is rejected before loading airports.json
+    return 0 < len(code) <= MAX_AIRPORT_CODE_LENGTH and code.isalnum()
+
+
+def get_weather_by_airport(
+    airport_code,
+    show_forecast=False,
+    debug=False,
+    days=7,
+    temp_unit_override=None,
+    airports=None,
+    no_emoji=False,
+    config=None,
+):
+    # Returns the airport record when the code resolves (even if the fetch fails), else None
+    if debug:
+        print(f"DEBUG: get_weather_by_airport({airport_code}, show_forecast={show_forecast}, days={days})")
+    if not is_plausible_airport_code(airport_code):
+        print(f"Unknown airport code: {airport_code}")
+        return
+    airports = airports or load_airports()
+    airport = airports.get(airport_code.upper())
+    if not airport:
+        print(f"Unknown airport code: {airport_code}")
+        return
+    # Determine temperature unit from config
+    if config is None:
+        config = load_config()
+    temp_unit = _resolve_temp_unit(temp_unit_override, config)
+    url = _build_url(airport, temp_unit, days)
+    if debug:
+        print(f"DEBUG: Requesting URL: {url}")
+    _prune_http_cache()
+    try:
+        status_code, content, from_cache = _fetch_weather(url)
     except requests.RequestException as e:
         print(f"Error: Could not fetch weather for {airport_code}: {e}")
-        return
+        return airport
+    data = _parse_weather_response(airport_code, status_code, content, from_cache=from_cache, debug=debug)
+    if data is None:
+        return airport
+    _render_weather(
+        airport_code,
+        airport,
+        data,
+        config,
+        temp_unit,
+        show_forecast=show_forecast,
+        days=days,
+        no_emoji=no_emoji,
+    )
+    return airport
 
-    if resp.status_code != 200:
-        print(f"Error: Could not fetch weather for {airport_code} (status {resp.status_code})")
-        return
+
+def _format_forecast_table(daily, temp_symbol, days, no_emoji=False):
+    """
+    Build the multi-day forecast table and return it as a list of lines.
+    """
+    forecast_days = daily.get('time', [])
+    tmax = daily.get('temperature_2m_max', [])
+    tmin = daily.get('temperature_2m_min', [])
+    wcode = daily.get('weathercode', [])
+    precip = daily.get('precipitation_sum', [])
+    sunrises = daily.get('sunrise', [])
+    sunsets = daily.get('sunset', [])
+    lines = [f"\n{min(days, len(forecast_days))}-Day Forecast:", "-" * 80]
+    # Calculate max display width for all columns for perfect alignment
+    weather_icons = []
+    weather_descs = []
+    # Display widths of the emoji/description cells, measured once per row
+    icon_widths = []
+    desc_widths = []
+    date_strs = []
+    tmax_strs = []
+    tmin_strs = []
+    precip_strs = []
+    sunrise_strs = []
+    sunset_strs = []
+    pad_weather = 22
+    pad_date = 12
+    pad_temp = 8
+    pad_precip = 8
+    pad_sun = 8
+    max_icon_width = 6
+    max_desc_width = max(pad_weather, _display_width("Weather"))
+    max_date_width = max(pad_date, _display_width("Date"))
+    max_tmax_width = max(pad_temp, _display_width("High"))
+    max_tmin_width = max(pad_temp, _display_width("Low"))
+    max_precip_width = max(pad_precip, _display_width("Precip"))
+    max_sunrise_width = max(pad_sun, _display_width("Sunrise"))
+    max_sunset_width = max(pad_sun, _display_width("Sunset"))
+    n = min(days, len(forecast_days))
+    for i in range(n):
+        icon, desc = _weather_code_parts(wcode[i])
+        if no_emoji:
+            icon = ""
+        ds = str(forecast_days[i])
+        tmaxs = f"{tmax[i]}{temp_symbol}"
+        tmins = f"{tmin[i]}{temp_symbol}"
+        precs = f"{precip[i]}mm"
+        sr = sunrises[i][-5:] if i < len(sunrises) and sunrises[i] else ''
+        ss = sunsets[i][-5:] if i < len(sunsets) and sunsets[i] else ''
+        desc_width = _display_width(desc)
+        weather_icons.append(icon)
+        weather_descs.append(desc)
+        icon_widths.append(_display_width(icon))
+        desc_widths.append(desc_width)
+        date_strs.append(ds)
+        tmax_strs.append(tmaxs)
+        tmin_strs.append(tmins)
+        precip_strs.append(precs)
+        sunrise_strs.append(sr)
+        sunset_strs.append(ss)
+        # Track column widths as rows are built
+        max_desc_width = max(max_desc_width, desc_width)
+        max_date_width = max(max_date_width, _display_width(ds))
+        max_tmax_width = max(max_tmax_width, _display_width(tmaxs))
+        max_tmin_width = max(max_tmin_width, _display_width(tmins))
+        max_precip_width = max(max_precip_width, _display_width(precs))
+        max_sunrise_width = max(max_sunrise_width, _display_width(sr))
+        max_sunset_width = max(max_sunset_width, _display_width(ss))
+    # Print header
+    if no_emoji:
+        lines.append(
+            f"{'Date':<{max_date_width}} {'Weather':<{max_desc_width}} {'High':>{max_tmax_width}} {'Low':>{max_tmin_width}} {'Precip':>{max_precip_width}} {'Sunrise':>{max_sunrise_width}} {'Sunset':>{max_sunset_width}}")
+        lines.append("-" * (
+                    max_date_width + max_desc_width + max_tmax_width + max_tmin_width + max_precip_width + max_sunrise_width + max_sunset_width + 6))
+    else:
+        lines.append(
+            f"{'Date':<{max_date_width}} {'Wx':<{max_icon_width}} {'Weather':<{max_desc_width}} {'High':>{max_tmax_width}} {'Low':>{max_tmin_width}} {'Precip':>{max_precip_width}} {'Sunrise':>{max_sunrise_width}} {'Sunset':>{max_sunset_width}}")
+        lines.append("-" * (
+                    max_date_width + max_icon_width + max_desc_width + max_tmax_width + max_tmin_width + max_precip_width + max_sunrise_width + max_sunset_width + 7))
+    # Print rows
+    for i in range(n):
+        icon = weather_icons[i]
+        desc = weather_descs[i]
+        ds = date_strs[i]
+        tmaxs = tmax_strs[i]
+        tmins = tmin_strs[i]
+        precs = precip_strs[i]
+        srs = sunrise_strs[i]
+        sss = sunset_strs[i]
+        # Emoji cells need display-width padding; the rest pad by length
+        icon = icon + ' ' * (max_icon_width - icon_widths[i])
+        desc = desc + ' ' * (max_desc_width - desc_widths[i])
+        ds = ds.ljust(max_date_width)
+        tmaxs = tmaxs.rjust(max_tmax_width)
+        tmins = tmins.rjust(max_tmin_width)
+        precs = precs.rjust(max_precip_width)
+        srs = srs.rjust(max_sunrise_width)
+        sss = sss.rjust(max_sunset_width)
+        if no_emoji:
+            lines.append(f"{ds} {desc} {tmaxs} {tmins} {precs} {srs} {sss}")
+        else:
+            lines.append(f"{ds} {icon} {desc} {tmaxs} {tmins} {precs} {srs} {sss}")
+    return lines
+
+
+def _render_weather(airport_code, airport, data, config, temp_unit, show_forecast=False, days=7, no_emoji=False):
+    temp_symbol = '°F' if temp_unit == 'F' else '°C'
+    provider = config.get('provider', 'open-meteo')
+    providers = config.get('providers', {})
+    provider_info = providers.get(provider, {})
+    provider_url = provider_info.get('url', 'https://api.open-meteo.com/v1/forecast')
+    name = airport.get("name", "")
+    city = airport.get("city", "")
+    lat = airport.get("lat", 0)
+    lon = airport.get("lon", 0)
     current = data.get("current", {}) or data.get("current_weather", {})
     current_units = data.get("current_units", {}) or data.get("current_weather_units", {})
     print("\n" + "=" * 40)
@@ -440,10 +934,9 @@ def get_weather_by_airport(
     sunrise = None
     sunset = None
     if 'sunrise' in daily and 'sunset' in daily and 'time' in daily:
-        from datetime import datetime
-        now = datetime.now().date()
+        today = str(datetime.now().date())
         for i, d in enumerate(daily['time']):
-            if d == str(now):
+            if d == today:
                 today_idx = i
                 break
         try:
@@ -497,132 +990,9 @@ def get_weather_by_airport(
         print("No current weather data available.")
 
     if show_forecast:
-        forecast_days = daily.get('time', [])
-        tmax = daily.get('temperature_2m_max', [])
-        tmin = daily.get('temperature_2m_min', [])
-        wcode = daily.get('weathercode', [])
-        precip = daily.get('precipitation_sum', [])
-        sunrises = daily.get('sunrise', [])
-        sunsets = daily.get('sunset', [])
-        print(f"\n{min(days, len(forecast_days))}-Day Forecast:")
-        print("-" * 80)
-        # Calculate max display width for all columns for perfect alignment
-        weather_icons = []
-        weather_descs = []
-        date_strs = []
-        tmax_strs = []
-        tmin_strs = []
-        precip_strs = []
-        sunrise_strs = []
-        sunset_strs = []
-        pad_weather = 22
-        pad_date = 12
-        pad_temp = 8
-        pad_precip = 8
-        pad_sun = 8
-        n = min(days, len(forecast_days))
-        for i in range(n):
-            weather_str = weather_code_to_emoji(wcode[i], with_emoji=not no_emoji)
-            parts = weather_str.split()
-            if len(parts) > 1:
-                icon = parts[0]
-                desc = ' '.join(parts[1:])
-                weather_str = f"{icon} {desc}"
-            elif len(parts) == 1:
-                # For single-word, split emoji from word using unicode category
-                import unicodedata
-                s = parts[0]
-                # Find the first non-symbol character (start of word)
-                split_idx = 0
-                for idx, ch in enumerate(s):
-                    if unicodedata.category(ch)[0] != 'S':
-                        split_idx = idx
-                        break
-                # Emoji is up to split_idx, word is after
-                icon = s[:split_idx]
-                desc = s[split_idx:]
-                if not icon:
-                    # fallback: treat as no emoji
-                    weather_str = desc
-                else:
-                    weather_str = f"{icon} {desc}"
-            icon = ""
-            desc = weather_str
-            if " " in weather_str:
-                icon, desc = weather_str.split(" ", 1)
-            weather_icons.append(icon)
-            weather_descs.append(desc)
-            date_strs.append(str(forecast_days[i]))
-            tmax_strs.append(f"{tmax[i]}{temp_symbol}")
-            tmin_strs.append(f"{tmin[i]}{temp_symbol}")
-            precip_strs.append(f"{precip[i]}mm")
-            sr = sunrises[i][-5:] if i < len(sunrises) and sunrises[i] else ''
-            ss = sunsets[i][-5:] if i < len(sunsets) and sunsets[i] else ''
-            sunrise_strs.append(sr)
-            sunset_strs.append(ss)
-        def display_width(text):
-            width = wcswidth(text)
-            if width < 0:
-                width = len(text)
-            return width
-
-        max_icon_width = 6
-        max_desc_width = max([display_width(d) for d in weather_descs] + [display_width("Weather"), pad_weather])
-        max_date_width = max([display_width(ds) for ds in date_strs] + [pad_date, display_width("Date")])
-        max_tmax_width = max([display_width(ts) for ts in tmax_strs] + [pad_temp, display_width("High")])
-        max_tmin_width = max([display_width(ts) for ts in tmin_strs] + [pad_temp, display_width("Low")])
-        max_precip_width = max([display_width(ps) for ps in precip_strs] + [pad_precip, display_width("Precip")])
-        max_sunrise_width = max([display_width(s) for s in sunrise_strs] + [pad_sun, display_width("Sunrise")])
-        max_sunset_width = max([display_width(s) for s in sunset_strs] + [pad_sun, display_width("Sunset")])
-        # Print header
-        if no_emoji:
-            print(
-                f"{'Date':<{max_date_width}} {'Weather':<{max_desc_width}} {'High':>{max_tmax_width}} {'Low':>{max_tmin_width}} {'Precip':>{max_precip_width}} {'Sunrise':>{max_sunrise_width}} {'Sunset':>{max_sunset_width}}")
-            print("-" * (
-                        max_date_width + max_desc_width + max_tmax_width + max_tmin_width + max_precip_width + max_sunrise_width + max_sunset_width + 6))
-        else:
-            print(
-                f"{'Date':<{max_date_width}} {'Wx':<{max_icon_width}} {'Weather':<{max_desc_width}} {'High':>{max_tmax_width}} {'Low':>{max_tmin_width}} {'Precip':>{max_precip_width}} {'Sunrise':>{max_sunrise_width}} {'Sunset':>{max_sunset_width}}")
-            print("-" * (
-                        max_date_width + max_icon_width + max_desc_width + max_tmax_width + max_tmin_width + max_precip_width + max_sunrise_width + max_sunset_width + 7))
-        # Print rows
-        for i in range(n):
-            icon = weather_icons[i] or ""
-            desc = weather_descs[i] or ""
-            ds = date_strs[i]
-            tmaxs = tmax_strs[i]
-            tmins = tmin_strs[i]
-            precs = precip_strs[i]
-            srs = sunrise_strs[i]
-            sss = sunset_strs[i]
-            icon_disp = display_width(icon)
-            if icon_disp < max_icon_width:
-                icon = icon + ' ' * (max_icon_width - icon_disp)
-            desc_disp = display_width(desc)
-            if desc_disp < max_desc_width:
-                desc = desc + ' ' * (max_desc_width - desc_disp)
-            ds_disp = display_width(ds)
-            if ds_disp < max_date_width:
-                ds = ds + ' ' * (max_date_width - ds_disp)
-            tmax_disp = display_width(tmaxs)
-            if tmax_disp < max_tmax_width:
-                tmaxs = ' ' * (max_tmax_width - tmax_disp) + tmaxs
-            tmin_disp = display_width(tmins)
-            if tmin_disp < max_tmin_width:
-                tmins = ' ' * (max_tmin_width - tmin_disp) + tmins
-            prec_disp = display_width(precs)
-            if prec_disp < max_precip_width:
-                precs = ' ' * (max_precip_width - prec_disp) + precs
-            srs_disp = display_width(srs)
-            if srs_disp < max_sunrise_width:
-                srs = ' ' * (max_sunrise_width - srs_disp) + srs
-            sss_disp = display_width(sss)
-            if sss_disp < max_sunset_width:
-                sss = ' ' * (max_sunset_width - sss_disp) + sss
-            if no_emoji:
-                print(f"{ds} {desc} {tmaxs} {tmins} {precs} {srs} {sss}")
-            else:
-                print(f"{ds} {icon} {desc} {tmaxs} {tmins} {precs} {srs} {sss}")
+        # Build the whole table and emit it with a single write
+        lines = _format_forecast_table(daily, temp_symbol, days, no_emoji)
+        sys.stdout.write("\n".join(lines) + "\n")
     print("=" * 40 + "\n")
 
 
@@ -635,10 +1005,10 @@ def get_nws_zone_forecast(lat, lon, debug=False):
     if debug:
         print(f"DEBUG: NWS points URL: {points_url}")
     try:
-        resp = requests.get(points_url, headers=headers, timeout=REQUEST_TIMEOUT)
+        resp = _get_session().get(points_url, headers=headers, timeout=REQUEST_TIMEOUT)
         if resp.status_code != 200:
             return None, f"Error: NWS points lookup failed ({resp.status_code})"
-        data = resp.json()
+        data = _json_loads(resp.content)
     except Exception as e:
         return None, f"Error: NWS points lookup failed ({e})"
 
@@ -651,10 +1021,10 @@ def get_nws_zone_forecast(lat, lon, debug=False):
     if debug:
         print(f"DEBUG: NWS zone forecast URL: {zone_forecast_url}")
     try:
-        resp = requests.get(zone_forecast_url, headers=headers, timeout=REQUEST_TIMEOUT)
+        resp = _get_session().get(zone_forecast_url, headers=headers, timeout=REQUEST_TIMEOUT)
         if resp.status_code != 200:
             return None, f"Error: NWS zone forecast failed ({resp.status_code})"
-        zdata = resp.json()
+        zdata = _json_loads(resp.content)
     except Exception as e:
         return None, f"Error: NWS zone forecast failed ({e})"
 
@@ -705,11 +1075,11 @@ def update_searches_cache(airport_code, airport, debug=False):
     if debug:
         print(f"DEBUG: NWS points URL: {points_url}")
     try:
-        resp = requests.get(points_url, headers=headers, timeout=REQUEST_TIMEOUT)
+        resp = _get_session().get(points_url, headers=headers, timeout=REQUEST_TIMEOUT)
         if resp.status_code != 200:
             print(f"Error: NWS points lookup failed ({resp.status_code})")
             return
-        data = resp.json()
+        data = _json_loads(resp.content)
     except Exception as e:
         print(f"Error: NWS points lookup failed ({e})")
         return
@@ -793,6 +1163,9 @@ def update_searches_cache(airport_code, airport, debug=False):
 def add_custom_airport():
     print("Add a custom airport:")
     code = input("Airport code (3-4 letters): ").strip().upper()
+    if not is_plausible_airport_code(code):
+        print("Invalid airport code.")
+        return
     name = input("Airport name: ").strip()
     city = input("City: ").strip()
     lat = input("Latitude: ").strip()
@@ -803,8 +1176,8 @@ def add_custom_airport():
     except ValueError:
         print("Invalid latitude or longitude.")
         return
-    # Add to airports.json
-    airports = load_airports()
+    # Add to airports.json (copy so the cached dict is not mutated)
+    airports = dict(load_airports())
     airports[code] = {
         "name": name,
         "city": city,
@@ -822,16 +1195,26 @@ def add_custom_airport():
     print(f"Added custom airport {code}: {name} ({city})")
 
 
+def get_favorites_path():
+    return os.path.join(get_app_dir(), 'favorites.json')
+
+
 def load_favorites():
     # Stub: load favorites from favorites.json
-    path = os.path.join(get_app_dir(), 'favorites.json')
-    if os.path.exists(path):
+    path = get_favorites_path()
+    # Return a copy since callers append/remove before saving
+    return list(_load_favorites_cached(path, _file_mtime_ns(path)))
+
+
+@functools.lru_cache(maxsize=4)
+def _load_favorites_cached(path, mtime_ns):
+    if mtime_ns is not None:
         try:
-            with open(path, 'r') as f:
-                return json.load(f)
+            with open(path, 'rb') as f:
+                return tuple(_json_loads(f.read()))
         except Exception as e:
             print(f"Warning: Could not load favorites.json: {e}")
-    return []
+    return ()
 
 
 def add_favorite(code):
@@ -840,9 +1223,9 @@ def add_favorite(code):
     code = code.upper()
     if code not in favorites:
         favorites.append(code)
-        path = os.path.join(get_app_dir(), 'favorites.json')
-        with open(path, 'w') as f:
-            json.dump(favorites, f, indent=2)
+        with open(get_favorites_path(), 'wb') as f:
+            f.write(_json_dumps(favorites))
+        _load_favorites_cached.cache_clear()
         print(f"Added {code} to favorites.")
     else:
         print(f"{code} is already a favorite.")
@@ -854,9 +1237,9 @@ def remove_favorite(code):
     code = code.upper()
     if code in favorites:
         favorites.remove(code)
-        path = os.path.join(get_app_dir(), 'favorites.json')
-        with open(path, 'w') as f:
-            json.dump(favorites, f, indent=2)
+        with open(get_favorites_path(), 'wb') as f:
+            f.write(_json_dumps(favorites))
+        _load_favorites_cached.cache_clear()
         print(f"Removed {code} from favorites.")
     else:
         print(f"{code} is not in favorites.")
@@ -892,34 +1275,36 @@ def list_airports():
             print(f"  {code}: {name}{suffix}")
 
 
+def _airport_haystack(entry):
+    # Lowercased record text that search_airports matches queries against (the
+    # lookup code is checked separately, since alias codes share one record)
+    return " ".join([
+        entry.get("name") or "",
+        entry.get("city") or "",
+        entry.get("iso_country") or "",
+        entry.get("iso_region") or "",
+        entry.get("type") or "",
+        entry.get("scheduled_service") or "",
+        entry.get("local_code") or "",
+        entry.get("gps_code") or "",
+        entry.get("faa_lid") or "",
+    ]).lower()
+
+
 def search_airports(query):
     # Stub: search airports by code, name, or city
     airports = load_airports()
     query = query.lower()
+    query_upper = query.upper()
     found = False
     for code, entry in airports.items():
-        name = entry.get("name", "")
-        city = entry.get("city", "")
-        iso_country = entry.get("iso_country", "")
-        iso_region = entry.get("iso_region", "")
-        airport_type = entry.get("type", "")
-        scheduled_service = entry.get("scheduled_service", "")
-        local_code = entry.get("local_code", "")
-        gps_code = entry.get("gps_code", "")
-        faa_lid = entry.get("faa_lid", "")
-        haystack = " ".join([
-            code,
-            name,
-            city,
-            iso_country,
-            iso_region,
-            airport_type,
-            scheduled_service,
-            local_code,
-            gps_code,
-            faa_lid,
-        ]).lower()
-        if query in haystack:
+        haystack = entry.get("_search") or _airport_haystack(entry)
+        # Queries with a space can also span the code and the name, as in "jfk john"
+        if query_upper in code or query in haystack or (' ' in query and query in f"{code.lower()} {haystack}"):
+            name = entry.get("name", "")
+            city = entry.get("city", "")
+            iso_country = entry.get("iso_country", "")
+            iso_region = entry.get("iso_region", "")
             region_str = ", ".join([v for v in [iso_region, iso_country] if v])
             suffix = f" ({city})" if city else ""
             if region_str:
@@ -930,125 +1315,272 @@ def search_airports(query):
         print("No airports found matching query.")
 
 
+# OurAirports airports.csv columns used by update_airports
+AIRPORT_CSV_COLUMNS = (
+    'icao_code',
+    'iata_code',
+    'name',
+    'municipality',
+    'iso_country',
+    'iso_region',
+    'local_code',
+    'gps_code',
+    'elevation_ft',
+    'type',
+    'scheduled_service',
+    'latitude_deg',
+    'longitude_deg',
+)
+
+
+# Validators from the last airports.csv download, for conditional re-downloads
+def get_airports_meta_path():
+    return os.path.join(get_app_dir(), 'airports.meta.json')
+
+
+def _read_airports_meta():
+    try:
+        with open(get_airports_meta_path(), 'rb') as f:
+            meta = _json_loads(f.read())
+    except Exception:
+        return {}
+    return meta if isinstance(meta, dict) else {}
+
+
+def _write_airports_meta(meta):
+    try:
+        with open(get_airports_meta_path(), 'wb') as f:
+            f.write(_json_dumps(meta))
+    except OSError:
+        pass
+
+
+# Facility types left out of airports.json unless they have scheduled service
+SKIPPED_AIRPORT_TYPES = frozenset(('closed', 'heliport', 'seaplane_base'))
+
+
 def update_airports():
     """
     Download and update airports.json from OurAirports open data.
     """
     import csv
+    import gzip
+    import operator
     import ssl
+    import urllib.error
     import urllib.request
     url = "https://davidmegginson.github.io/ourairports-data/airports.csv"
     print("Downloading airports.csv from OurAirports...")
     try:
-        if certifi is not None:
-            context = ssl.create_default_context(cafile=certifi.where())
-            response = urllib.request.urlopen(url, context=context)
-        else:
-            response = urllib.request.urlopen(url)
-        lines = [l.decode('utf-8') for l in response.readlines()]
-        reader = csv.DictReader(lines)
-        airports = {}
-        for row in reader:
-            icao = row.get('icao_code', '').upper()
-            iata = row.get('iata_code', '').upper()
-            name = row.get('name', '').strip()
-            city = row.get('municipality', '').strip()
-            iso_country = row.get('iso_country', '').strip()
-            iso_region = row.get('iso_region', '').strip()
-            local_code = row.get('local_code', '').strip()
-            gps_code = row.get('gps_code', '').strip()
-            faa_lid = local_code
-            elevation_ft = row.get('elevation_ft')
-            airport_type = row.get('type', '').strip()
-            scheduled_service = row.get('scheduled_service', '').strip()
-            lat = row.get('latitude_deg')
-            lon = row.get('longitude_deg')
-            try:
-                lat = float(lat)
-                lon = float(lon)
-            except (TypeError, ValueError):
-                continue
-            if not name:
-                continue
-            try:
-                elevation_ft = int(float(elevation_ft)) if elevation_ft not in (None, "") else None
-            except (TypeError, ValueError):
-                elevation_ft = None
-            if icao:
-                airports[icao] = {
-                    "name": name,
-                    "city": city,
-                    "lat": lat,
-                    "lon": lon,
-                    "icao_code": icao,
-                    "iata_code": iata,
-                    "iso_country": iso_country,
-                    "iso_region": iso_region,
-                    "elevation_ft": elevation_ft,
-                    "type": airport_type,
-                    "scheduled_service": scheduled_service,
-                    "local_code": local_code,
-                    "gps_code": gps_code,
-                    "faa_lid": faa_lid,
-                }
-            if iata and iata != icao:
-                airports[iata] = {
-                    "name": name,
-                    "city": city,
-                    "lat": lat,
-                    "lon": lon,
-                    "icao_code": icao,
-                    "iata_code": iata,
-                    "iso_country": iso_country,
-                    "iso_region": iso_region,
-                    "elevation_ft": elevation_ft,
-                    "type": airport_type,
-                    "scheduled_service": scheduled_service,
-                    "local_code": local_code,
-                    "gps_code": gps_code,
-                    "faa_lid": faa_lid,
-                }
-            if local_code and local_code not in (icao, iata):
-                airports[local_code] = {
-                    "name": name,
-                    "city": city,
-                    "lat": lat,
-                    "lon": lon,
-                    "icao_code": icao,
-                    "iata_code": iata,
-                    "iso_country": iso_country,
-                    "iso_region": iso_region,
-                    "elevation_ft": elevation_ft,
-                    "type": airport_type,
-                    "scheduled_service": scheduled_service,
-                    "local_code": local_code,
-                    "gps_code": gps_code,
-                    "faa_lid": faa_lid,
-                }
-            if gps_code and gps_code not in (icao, iata, local_code):
-                airports[gps_code] = {
-                    "name": name,
-                    "city": city,
-                    "lat": lat,
-                    "lon": lon,
-                    "icao_code": icao,
-                    "iata_code": iata,
-                    "iso_country": iso_country,
-                    "iso_region": iso_region,
-                    "elevation_ft": elevation_ft,
-                    "type": airport_type,
-                    "scheduled_service": scheduled_service,
-                    "local_code": local_code,
-                    "gps_code": gps_code,
-                    "faa_lid": faa_lid,
-                }
+        # Ask for a gzip-compressed transfer; the CSV compresses several-fold
+        headers = {'Accept-Encoding': 'gzip'}
+        # Only revalidate if airports.json is still exactly what the last update wrote
+        meta = _read_airports_meta()
+        airports_mtime_ns = _file_mtime_ns(get_airports_path())
+        if airports_mtime_ns is not None and meta.get('airports_mtime_ns') == airports_mtime_ns:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        request = urllib.request.Request(url, headers=headers)
+        try:
+            if certifi is not None:
+                context = ssl.create_default_context(cafile=certifi.where())
+                response = urllib.request.urlopen(request, context=context)
+            else:
+                response = urllib.request.urlopen(request)
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                e.close()
+                print("airports.json is already up to date.")
+                return
+            raise
+        # Close the connection once parsing is done, or if it fails part-way
+        with response:
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            stream = response
+            if response.headers.get('Content-Encoding', '').lower() == 'gzip':
+                stream = gzip.GzipFile(fileobj=response)
+            # Stream rows straight from the response instead of buffering the whole CSV
+            with io.TextIOWrapper(stream, encoding='utf-8', newline='') as text:
+                reader = csv.reader(text)
+                # Resolve the columns we need once; rows are then plain lists indexed by position
+                header = next(reader)
+                missing = [c for c in AIRPORT_CSV_COLUMNS if c not in header]
+                if missing:
+                    raise ValueError(f"airports.csv is missing columns: {', '.join(missing)}")
+                # Pulls every needed field out of a row in one call, in AIRPORT_CSV_COLUMNS order
+                select_columns = operator.itemgetter(*(header.index(c) for c in AIRPORT_CSV_COLUMNS))
+                n_columns = len(header)
+                airports = {}
+                for row in reader:
+                    if len(row) < n_columns:
+                        continue
+                    (icao, iata, name, city, iso_country, iso_region, local_code, gps_code,
+                     elevation_ft, airport_type, scheduled_service, lat, lon) = select_columns(row)
+                    # Drop rows that can never be stored before doing any other work
+                    airport_type = airport_type.strip()
+                    scheduled_service = scheduled_service.strip()
+                    if airport_type in SKIPPED_AIRPORT_TYPES and scheduled_service != 'yes':
+                        continue
+                    name = name.strip()
+                    if not name:
+                        continue
+                    icao = icao.upper()
+                    iata = iata.upper()
+                    local_code = local_code.strip()
+                    gps_code = gps_code.strip()
+                    if not (icao or iata or local_code or gps_code):
+                        continue
+                    try:
+                        lat = float(lat)
+                        lon = float(lon)
+                    except (TypeError, ValueError):
+                        continue
+                    # Chained comparisons also reject NaN, which float() accepts
+                    if not (-90.0 <= lat <= 90.0 and -180.0 <= lon <= 180.0):
+                        continue
+                    city = sys.intern(city.strip())
+                    # Low-cardinality columns: share one string object per distinct value
+                    iso_country = sys.intern(iso_country.strip())
+                    iso_region = sys.intern(iso_region.strip())
+                    faa_lid = local_code
+                    airport_type = sys.intern(airport_type)
+                    scheduled_service = sys.intern(scheduled_service)
+                    try:
+                        elevation_ft = int(float(elevation_ft)) if elevation_ft not in (None, "") else None
+                    except (TypeError, ValueError):
+                        elevation_ft = None
+                    # One record per row, shared by every alias code below
+                    record = {
+                        "name": name,
+                        "city": city,
+                        "lat": lat,
+                        "lon": lon,
+                        "icao_code": icao,
+                        "iata_code": iata,
+                        "iso_country": iso_country,
+                        "iso_region": iso_region,
+                        "elevation_ft": elevation_ft,
+                        "type": airport_type,
+                        "scheduled_service": scheduled_service,
+                        "local_code": local_code,
+                        "gps_code": gps_code,
+                        "faa_lid": faa_lid,
+                    }
+                    # Repeated codes just store the same record again, so no dedup is needed
+                    for code in (icao, iata, local_code, gps_code):
+                        if code:
+                            airports[code] = record
         save_airports(airports)
+        _write_airports_meta({
+            'etag': etag,
+            'last_modified': last_modified,
+            'airports_mtime_ns': _file_mtime_ns(get_airports_path()),
+        })
         print(f"Updated airports.json with {len(airports)} airports.")
     except Exception as e:
         print(f"Failed to update airports: {e}")
 
 
+def get_airports_update_log_path():
+    return os.path.join(get_app_dir(), 'airports_update.log')
+
+
+def update_airports_in_background():
+    """
+    Run --update-airports in a detached process so the shell returns immediately.
+    """
+    import subprocess
+    if getattr(sys, "frozen", False):
+        command = [sys.executable, "--update-airports"]
+    else:
+        command = [sys.executable, os.path.abspath(__file__), "--update-airports"]
+    if os.name == "nt":
+        detach = {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+        detach = {"start_new_session": True}
+    log_path = get_airports_update_log_path()
+    try:
+        with open(log_path, 'w') as log:
+            process = subprocess.Popen(
+                command,
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                **detach,
+            )
+    except OSError as e:
+        print(f"Failed to start background airports update: {e}")
+        return
+    print(f"Updating airports.json in the background (pid {process.pid}); progress is written to {log_path}.")
+
+
+def weather_for_airport_code(airport_code, show_forecast=False, debug=False, days=7, temp_unit_override=None, no_emoji=False, zone_forecast=False):
+    airport = get_weather_by_airport(
+        airport_code,
+        show_forecast=show_forecast,
+        debug=debug,
+        days=days,
+        temp_unit_override=temp_unit_override,
+        no_emoji=no_emoji,
+    )
+    if airport:
+        if zone_forecast:
+            print_zone_forecast(airport_code, airport, debug=debug)
+        update_searches_cache(airport_code, airport, debug=debug)
+
+
+def weather_for_favorite_codes(show_forecast=False, debug=False, days=7, temp_unit_override=None, no_emoji=False, zone_forecast=False):
+    airports = load_airports()
+    favorites = load_favorites()
+    weather_for_favorites(
+        show_forecast=show_forecast,
+        debug=debug,
+        days=days,
+        temp_unit_override=temp_unit_override,
+        no_emoji=no_emoji,
+        favorites=favorites,
+        airports=airports,
+    )
+    favorite_codes = sorted(set(favorites))
+    if zone_forecast:
+        for code in favorite_codes:
+            airport = airports.get(code.upper())
+            if airport:
+                print_zone_forecast(code, airport, debug=debug)
+    for code in favorite_codes:
+        airport = airports.get(code.upper())
+        if airport:
+            update_searches_cache(code, airport, debug=debug)
+
+
+# Commands that are a single flag with no arguments, run without building the argparse parser
+_BARE_COMMANDS = {
+    "--weather-favorites": weather_for_favorite_codes,
+    "-wf": weather_for_favorite_codes,
+    "--list-favorites": list_favorites,
+    "-lf": list_favorites,
+    "--list-airports": list_airports,
+    "-l": list_airports,
+}
+
+
 def main():
+    # Plain `weather.py CODE` and bare-flag commands are the common cases;
+    # they need none of the option parsing
+    if len(sys.argv) == 2:
+        arg = sys.argv[1]
+        if not arg.startswith('-'):
+            weather_for_airport_code(arg)
+            return
+        command = _BARE_COMMANDS.get(arg)
+        if command is not None:
+            command()
+            return
+
+    import argparse
     parser = argparse.ArgumentParser(
         description="Get current weather by airport code (ICAO/IATA).",
     )
@@ -1065,11 +1597,14 @@ def main():
     parser.add_argument("--search", "-s", metavar="QUERY", help="Search airports")
     parser.add_argument("--add-airport", "-a", action="store_true", help="Add a custom airport")
     parser.add_argument("--update-airports", action="store_true", help="Update airports database")
+    parser.add_argument("--background", action="store_true", help="Run the airports update in the background (requires --update-airports)")
     parser.add_argument("--no-emoji", action="store_true", help="Disable emoji in weather output")
     parser.add_argument("--zone-forecast", "-zf", action="store_true", help="Show NWS zone forecast for location")
     parser.add_argument("--setup", action="store_true", help="Create a default config.json")
     parser.add_argument("--version", action="store_true", help="Show version and exit")
     args = parser.parse_args()
+    if args.background and not args.update_airports:
+        parser.error("--background requires --update-airports")
 
     if args.version:
         try:
@@ -1095,24 +1630,14 @@ def main():
             tee = Tee(os.path.join(get_app_dir(), "weather_output.txt"))
 
         if args.weather_favorites:
-            weather_for_favorites(
+            weather_for_favorite_codes(
                 show_forecast=args.forecast,
                 debug=debug,
                 days=days,
                 temp_unit_override=temp_unit_override,
                 no_emoji=args.no_emoji,
+                zone_forecast=args.zone_forecast,
             )
-            airports = load_airports()
-            favorite_codes = sorted(load_favorites())
-            if args.zone_forecast:
-                for code in favorite_codes:
-                    airport = airports.get(code.upper())
-                    if airport:
-                        print_zone_forecast(code, airport, debug=debug)
-            for code in favorite_codes:
-                airport = airports.get(code.upper())
-                if airport:
-                    update_searches_cache(code, airport, debug=debug)
             return
         if args.add_favorite:
             add_favorite(args.add_favorite)
@@ -1124,7 +1649,10 @@ def main():
             list_favorites()
             return
         if args.update_airports:
-            update_airports()
+            if args.background:
+                update_airports_in_background()
+            else:
+                update_airports()
             return
         if args.list_airports:
             list_airports()
@@ -1139,23 +1667,15 @@ def main():
             add_custom_airport()
             return
         if args.airport_code:
-            airports = load_airports()
-            get_weather_by_airport(
+            weather_for_airport_code(
                 args.airport_code,
                 show_forecast=args.forecast,
                 debug=debug,
                 days=days,
                 temp_unit_override=temp_unit_override,
-                airports=airports,
                 no_emoji=args.no_emoji,
+                zone_forecast=args.zone_forecast,
             )
-            if args.zone_forecast:
-                airport = airports.get(args.airport_code.upper())
-                if airport:
-                    print_zone_forecast(args.airport_code, airport, debug=debug)
-            airport = airports.get(args.airport_code.upper())
-            if airport:
-                update_searches_cache(args.airport_code, airport, debug=debug)
             return
 
         print("No command provided. Use --help for usage.")